@@ -0,0 +1,595 @@
+"""Performance benchmarks for the StockSim backend.
+
+Usage:
+    python benchmarks.py              # run everything
+    python benchmarks.py indicators   # run selected benchmarks
+"""
+import gc
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from app import (BarFileStore, SweepRunner, bars_to_frame, compute_indicators, frame_to_records,
+                 parse_daily_series, run_backtest, sweep_chunk)
+
+FULL_HISTORY_BARS = 25 * 252  # roughly what outputsize=full returns for an older listing
+
+def synthetic_daily_frame(bars=FULL_HISTORY_BARS, seed=0):
+    """Random-walk OHLCV series shaped like a parsed TIME_SERIES_DAILY response"""
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+    open_ = close * (1 + rng.normal(0, 0.003, bars))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, bars))),
+        'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, bars))),
+        'close': close,
+        'volume': rng.integers(1_000_000, 50_000_000, bars)
+    }, index=pd.bdate_range('2000-01-03', periods=bars, name='date'))
+
+def synthetic_payload(frame):
+    """The raw 'Time Series (Daily)' dict Alpha Vantage would send for a frame"""
+    return {
+        row.Index.strftime('%Y-%m-%d'): {
+            '1. open': f'{row.open:.4f}', '2. high': f'{row.high:.4f}', '3. low': f'{row.low:.4f}',
+            '4. close': f'{row.close:.4f}', '5. volume': str(int(row.volume))
+        }
+        for row in frame.iloc[::-1].itertuples()
+    }
+
+def best_of(fn, repeat=5):
+    """Best wall-clock time in seconds over several runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def memory_mb(field):
+    """A memory counter from /proc/self/status, e.g. RssAnon or RssFile (Linux only, None elsewhere)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+def report(title, rows):
+    print(f"\n{title}")
+    for label, seconds, baseline in rows:
+        speedup = f"{baseline / seconds:8.1f}x" if baseline else ''
+        print(f"  {label:<34} {seconds * 1000:10.2f} ms {speedup}")
+
+# Per-row reference implementations (what we'd write without pandas)
+def naive_parse(time_series):
+    daily_data = []
+    for date, values in time_series.items():
+        daily_data.append({
+            'date': date,
+            'open': float(values['1. open']),
+            'high': float(values['2. high']),
+            'low': float(values['3. low']),
+            'close': float(values['4. close']),
+            'volume': int(values['5. volume'])
+        })
+    daily_data.sort(key=lambda x: x['date'], reverse=True)
+    return daily_data
+
+def naive_ema(values, span):
+    alpha = 2 / (span + 1)
+    out = []
+    for value in values:
+        out.append(value if not out else alpha * value + (1 - alpha) * out[-1])
+    return out
+
+def naive_indicators(records, sma_windows=(20, 50, 200), rsi_period=14):
+    closes = [row['close'] for row in reversed(records)]
+    rows = [{'close': close} for close in closes]
+
+    for window in sma_windows:
+        for i in range(len(closes)):
+            rows[i][f'sma_{window}'] = sum(closes[i - window + 1:i + 1]) / window if i >= window - 1 else None
+
+    ema_12, ema_26 = naive_ema(closes, 12), naive_ema(closes, 26)
+    macd = [a - b for a, b in zip(ema_12, ema_26)]
+    signal = naive_ema(macd, 9)
+
+    avg_gain = avg_loss = 0
+    peak = closes[0]
+    for i, close in enumerate(closes):
+        row = rows[i]
+        row['ema_12'], row['ema_26'] = ema_12[i], ema_26[i]
+        row['macd'], row['macd_signal'], row['macd_histogram'] = macd[i], signal[i], macd[i] - signal[i]
+
+        change = close - closes[i - 1] if i else 0
+        if i:
+            avg_gain += (max(change, 0) - avg_gain) / rsi_period
+            avg_loss += (max(-change, 0) - avg_loss) / rsi_period
+        row['rsi'] = 100 - 100 / (1 + avg_gain / avg_loss) if i >= rsi_period and avg_loss else None
+
+        if i >= 19:
+            window = closes[i - 19:i + 1]
+            mean = sum(window) / 20
+            std = math.sqrt(sum((c - mean) ** 2 for c in window) / 20)
+            row['bollinger_upper'], row['bollinger_lower'] = mean + 2 * std, mean - 2 * std
+
+            returns = [closes[j] / closes[j - 1] - 1 for j in range(max(i - 19, 1), i + 1)]
+            mean_return = sum(returns) / len(returns)
+            variance = sum((r - mean_return) ** 2 for r in returns) / max(len(returns) - 1, 1)
+            row['volatility'] = math.sqrt(variance) * math.sqrt(252)
+
+        peak = max(peak, close)
+        row['drawdown'] = close / peak - 1
+    return rows
+
+def naive_crossover(opens, closes, fast=20, slow=50, cash=10000.0):
+    """Single-symbol SMA crossover stepped bar by bar"""
+    shares, signal, equity = 0, False, []
+    for i in range(len(closes)):
+        if i and signal and not shares:
+            shares = math.floor(cash / opens[i])
+            cash -= shares * opens[i]
+        elif i and not signal and shares:
+            cash += shares * opens[i]
+            shares = 0
+        if i >= slow - 1:
+            signal = sum(closes[i - fast + 1:i + 1]) / fast > sum(closes[i - slow + 1:i + 1]) / slow
+        equity.append(cash + shares * closes[i])
+    return equity
+
+def bench_indicators():
+    frame = synthetic_daily_frame()
+    payload = synthetic_payload(frame)
+    records = frame_to_records(frame)
+
+    naive_parse_time = best_of(lambda: naive_parse(payload))
+    naive_time = best_of(lambda: naive_indicators(records), repeat=3)
+    report(f"Daily series analytics, {len(frame)} bars (full history)", [
+        ('parse: per-row dicts', naive_parse_time, None),
+        ('parse: parse_daily_series', best_of(lambda: parse_daily_series(payload)), naive_parse_time),
+        ('indicators: per-row Python', naive_time, None),
+        ('indicators: compute_indicators', best_of(lambda: compute_indicators(frame)), naive_time),
+    ])
+
+    # Both implementations should agree on the latest values
+    vectorized = compute_indicators(frame).iloc[-1]
+    naive = naive_indicators(records)[-1]
+    for column in ('sma_200', 'macd', 'rsi', 'bollinger_upper', 'drawdown'):
+        assert abs(vectorized[column] - naive[column]) < 1e-6, column
+
+def bench_bar_files(symbols=200):
+    query_start, query_end = date(2023, 1, 1), date(2023, 12, 31)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = BarFileStore(directory)
+        for seed in range(symbols):
+            store.write(f'S{seed}', synthetic_daily_frame(seed=seed))
+        gc.collect()
+
+        # What each worker held before: one list of dicts per full-history symbol
+        private_before = memory_mb('RssAnon')
+        dict_lists = [frame_to_records(synthetic_daily_frame(seed=seed)) for seed in range(symbols)]
+        dict_private = memory_mb('RssAnon') - private_before if private_before is not None else None
+        dict_time = best_of(lambda: [[row for row in rows if '2023-01-01' <= row['date'] <= '2023-12-31']
+                                     for rows in dict_lists])
+        del dict_lists
+        gc.collect()
+
+        private_before, shared_before = memory_mb('RssAnon'), memory_mb('RssFile')
+        mapped = [store.open(f'S{seed}') for seed in range(symbols)]
+        touched = sum(float(bars['close'].sum()) for bars in mapped)  # fault every page in
+        map_time = best_of(lambda: [store.slice(f'S{seed}', query_start, query_end) for seed in range(symbols)])
+        frame_time = best_of(lambda: [bars_to_frame(store.slice(f'S{seed}', query_start, query_end))
+                                      for seed in range(symbols)])
+
+        report(f"One-year range query across {symbols} symbols x {FULL_HISTORY_BARS} bars", [
+            ('list of dicts: filter', dict_time, None),
+            ('memmap: searchsorted slice', map_time, dict_time),
+            ('memmap: slice + DataFrame copy', frame_time, dict_time),
+        ])
+        if dict_private is not None and touched:
+            print(f"  Private memory per worker: list of dicts {dict_private:.1f} MB, "
+                  f"memmap {max(memory_mb('RssAnon') - private_before, 0):.1f} MB")
+            print(f"  Shared page cache for the mapped files: {memory_mb('RssFile') - shared_before:.1f} MB "
+                  f"({sum(bars.nbytes for bars in mapped) / 2 ** 20:.1f} MB on disk, counted once for all workers)")
+
+def bench_backtest(symbols=5, workers=os.cpu_count() or 1):
+    frames = [synthetic_daily_frame(seed=seed) for seed in range(symbols)]
+    opens = pd.DataFrame({f'S{seed}': frame['open'] for seed, frame in enumerate(frames)})
+    closes = pd.DataFrame({f'S{seed}': frame['close'] for seed, frame in enumerate(frames)})
+    bars = closes.size
+    
+    one_opens, one_closes = opens[['S0']], closes[['S0']]
+    naive_time = best_of(lambda: naive_crossover(one_opens['S0'].tolist(), one_closes['S0'].tolist()), repeat=3)
+    engine_time = best_of(lambda: run_backtest('sma_crossover', one_opens, one_closes))
+    report(f"SMA crossover, 1 symbol x {len(closes)} bars", [
+        ('per-bar Python loop', naive_time, None),
+        ('run_backtest', engine_time, naive_time),
+    ])
+    
+    timings = [(name, best_of(lambda: run_backtest(name, opens, closes), repeat=3)) for name in ('sma_crossover', 'rebalance', 'dca')]
+    report(f"Single runs, {symbols} symbols x {len(closes)} bars", [(name, seconds, None) for name, seconds in timings])
+    for name, seconds in timings:
+        print(f"  {name:<34} {bars / seconds:>13,.0f} bars/s")
+    
+    grid = {'fast': list(range(5, 55, 5)), 'slow': list(range(50, 275, 25))}
+    runs = len(grid['fast']) * len(grid['slow'])
+    param_sets = [{'fast': fast, 'slow': slow} for fast in grid['fast'] for slow in grid['slow']]
+    sequential = best_of(lambda: sweep_chunk('sma_crossover', opens, closes, param_sets, 10000), repeat=1)
+    runner = SweepRunner(workers)
+    runner.run('sma_crossover', opens, closes, {'fast': [5, 10], 'slow': [50]})  # start the pool outside the timing
+    pooled = best_of(lambda: runner.run('sma_crossover', opens, closes, grid), repeat=1)
+    runner.pool().shutdown()
+    report(f"Crossover sweep, {runs} runs x {symbols} symbols", [
+        ('sequential', sequential, None),
+        (f'process pool ({workers} workers)', pooled, sequential),
+    ])
+    print(f"  {'sequential':<34} {runs * bars / sequential:>13,.0f} bars/s")
+    print(f"  {'process pool':<34} {runs * bars / pooled:>13,.0f} bars/s")
+
+def bench_alerts(rules=1_000_000, symbols=500, quotes=5000):
+    from app import AlertEngine
+    rng = np.random.default_rng(0)
+    names = [f'S{number:03d}' for number in range(symbols)]
+    base = rng.uniform(20, 500, symbols)
+    rule_symbols = rng.integers(0, symbols, rules)
+    above = rng.random(rules) < 0.5
+    # Rules start on the not-yet-triggered side of the current price, up to 50% away
+    thresholds = base[rule_symbols] * np.where(above, rng.uniform(1.0, 1.5, rules), rng.uniform(0.5, 1.0, rules))
+    
+    # Random-walk quotes, 1% moves, for random symbols
+    quote_symbols = rng.integers(0, symbols, quotes)
+    prices = base.copy()
+    stream = []
+    for number in quote_symbols:
+        previous = float(prices[number])
+        prices[number] *= 1 + rng.normal(0, 0.01)
+        stream.append((number, previous, float(prices[number])))
+    
+    engine = AlertEngine(sync_interval=0)
+    before = memory_mb('RssAnon')
+    start = time.perf_counter()
+    for rule_id, (number, is_above, threshold) in enumerate(zip(rule_symbols.tolist(), above.tolist(), thresholds.tolist())):
+        engine.add_rule(rule_id, names[number], 'price_above' if is_above else 'price_below', threshold)
+    load = time.perf_counter() - start
+    after = memory_mb('RssAnon')
+    
+    by_symbol = [[] for _ in range(symbols)]  # [threshold, is_above, active] per rule, scanned in full
+    for number, is_above, threshold in zip(rule_symbols.tolist(), above.tolist(), thresholds.tolist()):
+        by_symbol[number].append([threshold, is_above, True])
+    
+    def indexed():
+        return sum(len(engine.match(names[number], {'price': price}, {'price': previous}))
+                   for number, previous, price in stream)
+    
+    def scan(rules):
+        fired = 0
+        for rule in rules:
+            if rule[2] and (previous < rule[0] <= price if rule[1] else price <= rule[0] < previous):
+                rule[2] = False
+                fired += 1
+        return fired
+    
+    start = time.perf_counter()
+    fired = indexed()
+    indexed_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    scanned = 0
+    for number, previous, price in stream:
+        scanned += scan(by_symbol[number])
+    symbol_scan_time = time.perf_counter() - start
+    
+    # Scanning every rule per quote (a polling loop over all users' rules) is too slow to run in full
+    sample = stream[:20]
+    all_rules = [rule for rules in by_symbol for rule in rules]
+    start = time.perf_counter()
+    for number, previous, price in sample:
+        scan(all_rules)
+    full_scan_time = (time.perf_counter() - start) * len(stream) / len(sample)
+    
+    assert fired == scanned, (fired, scanned)
+    memory = f", ~{after - before:.0f} MB" if before is not None else ''
+    print(f"\n{rules:,} alert rules on {symbols} symbols: indexed in {load:.1f}s{memory}; {fired:,} fired over {quotes:,} quotes")
+    report(f"Evaluating {quotes:,} quotes", [
+        ('scan every rule (extrapolated)', full_scan_time, None),
+        ("scan the symbol's rules", symbol_scan_time, full_scan_time),
+        ('threshold index (AlertEngine)', indexed_time, full_scan_time),
+    ])
+    print(f"  {'threshold index':<34} {indexed_time / quotes * 1e6:10.2f} us per quote")
+
+def db_load_worker(seconds, writers=8, readers=8):
+    """Child process for bench_db: mixed traffic against the database configured in the environment"""
+    from app import app, db, save_stock_prices, upgrade
+    with app.app_context():
+        upgrade()
+    
+    counts = {'writes': 0, 'reads': 0, 'quote_updates': 0, 'locked': 0, 'errors': 0}
+    lock = threading.Lock()
+    
+    def tally(key, response=None, error=None):
+        if response is not None and response.status_code >= 400:
+            error = (response.get_json() or {}).get('error') or str(response.status_code)
+        with lock:
+            if not error:
+                counts[key] += 1
+            else:
+                counts['locked' if 'locked' in error else 'errors'] += 1
+    
+    def client(number):
+        client = app.test_client()
+        client.post('/api/register', json={'username': f'load{number}', 'password': 'loadtest'})
+        client.post('/api/login', json={'username': f'load{number}', 'password': 'loadtest'})
+        return client
+    
+    def writer(client):
+        while time.perf_counter() < deadline:
+            tally('writes', client.post('/api/portfolio/transaction', json={
+                'symbol': 'LOAD', 'type': 'buy', 'quantity': 1, 'price': 10.0, 'date': '2024-01-02T10:00:00'}))
+    
+    def reader(client):
+        while time.perf_counter() < deadline:
+            tally('reads', client.get('/api/portfolio'))
+    
+    def quote_writer():
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                try:
+                    save_stock_prices({f'Q{i}': 100 + i for i in range(50)})
+                    tally('quote_updates')
+                except Exception as e:
+                    db.session.rollback()
+                    tally('quote_updates', error=str(e))
+    
+    clients = [client(number) for number in range(writers + readers)]
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=writer, args=(c,)) for c in clients[:writers]] + \
+              [threading.Thread(target=reader, args=(c,)) for c in clients[writers:]] + [threading.Thread(target=quote_writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(json.dumps(counts))
+
+def quote_load_worker(seconds, threads=8):
+    """Child process for bench_quote_writes: quote page views for cached symbols, counting write commits"""
+    from sqlalchemy import event
+    from app import Stock, api_client, app, db, price_buffer, upgrade
+    symbols = list(api_client.demo_quotes)
+    with app.app_context():
+        upgrade()
+        db.session.add_all(Stock(symbol=symbol, name=symbol) for symbol in symbols)
+        db.session.commit()
+        commits = []
+        event.listen(db.engine, 'commit', lambda connection: commits.append(1))
+    
+    requests = []
+    def viewer():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            client.get(f'/api/stocks/{symbols[len(requests) % len(symbols)]}/quote')
+            requests.append(1)
+    
+    deadline = time.perf_counter() + seconds
+    workers = [threading.Thread(target=viewer) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    price_buffer.flush()
+    with app.app_context():
+        stored = sum(1 for stock in Stock.query.all() if stock.last_price == api_client.demo_quotes[stock.symbol]['price'])
+    print(json.dumps({'requests': len(requests), 'commits': len(commits), 'stored': stored, 'symbols': len(symbols)}))
+
+# Simulated users for bench_load: (action, weight); symbols are drawn with Zipf-like popularity
+LOAD_MIX = [('quote', 40), ('chart', 15), ('watchlist', 10), ('watch', 5), ('portfolio', 20), ('transaction', 10)]
+
+class HttpLoadClient:
+    """The slice of Flask's test client the load worker uses, against a running server instead"""
+    
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+    
+    def get(self, path):
+        return self.session.get(self.base_url + path)
+    
+    def post(self, path, json=None):
+        return self.session.post(self.base_url + path, json=json)
+
+def load_worker(seconds):
+    """Child process for bench_load: concurrent users driving the main endpoints against replayed market data
+    
+    Runs in process through the test client, or against BENCH_LOAD_URL (a server started with
+    MARKET_DATA_SOURCE=replay) when set.
+    """
+    import random
+    from app import app, replay_market_data, upgrade
+    users = int(os.environ.get('BENCH_LOAD_USERS', 16))
+    url = os.environ.get('BENCH_LOAD_URL')
+    if not url:
+        with app.app_context():
+            upgrade()
+    
+    symbols = [listing[0] for listing in replay_market_data.get_listings()[:200]]
+    popularity = [1 / (rank + 1) for rank in range(len(symbols))]
+    actions, weights = zip(*LOAD_MIX)
+    latencies = {action: [] for action in actions}
+    errors = dict.fromkeys(actions, 0)
+    lock = threading.Lock()
+    run = f'{os.getpid()}-{int(time.time())}'  # fresh usernames when reusing a live server's database
+    
+    def login(number):
+        client = HttpLoadClient(url) if url else app.test_client()
+        client.post('/api/register', json={'username': f'load-{run}-{number}', 'password': 'loadtest'})
+        client.post('/api/login', json={'username': f'load-{run}-{number}', 'password': 'loadtest'})
+        return client
+    
+    def user(number, client):
+        rng = random.Random(number)
+        while time.perf_counter() < deadline:
+            action = rng.choices(actions, weights)[0]
+            symbol = rng.choices(symbols, popularity)[0]
+            start = time.perf_counter()
+            if action == 'quote':
+                response = client.get(f'/api/stocks/{symbol}/quote')
+            elif action == 'chart':
+                response = client.get(f'/api/stocks/{symbol}/chart')
+            elif action == 'watchlist':
+                response = client.get('/api/watchlist')
+            elif action == 'watch':
+                response = client.post('/api/watchlist/add', json={'symbol': symbol})
+            elif action == 'portfolio':
+                response = client.get('/api/portfolio')
+            else:
+                response = client.post('/api/portfolio/transaction', json={
+                    'symbol': symbol, 'type': 'buy', 'quantity': 1, 'price': 100.0, 'date': '2024-01-02T10:00:00'})
+            elapsed = time.perf_counter() - start
+            # Re-adding a watched symbol is an expected 400; anything else at or above 400 counts as an error
+            failed = response.status_code >= 400 and not (action == 'watch' and response.status_code == 400)
+            with lock:
+                latencies[action].append(elapsed)
+                errors[action] += failed
+    
+    clients = [login(number) for number in range(users)]
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=user, args=(number, client)) for number, client in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    def summary(samples, failed):
+        samples = np.array(samples or [np.nan])
+        return {'requests': int(np.isfinite(samples).sum()), 'errors': failed,
+                'p50': float(np.percentile(samples, 50)), 'p99': float(np.percentile(samples, 99))}
+    counts = {action: summary(latencies[action], errors[action]) for action in actions}
+    counts['all'] = summary(sum(latencies.values(), []), sum(errors.values()))
+    print(json.dumps({'users': users, 'target': url or 'test client', 'endpoints': counts}))
+
+def screener_worker(symbols, bars=260):
+    """Child process for bench_screener: a synthetic local store of daily series, summarized then screened"""
+    from sqlalchemy import insert
+    from app import (DailyBar, PriceHistory, app, db, screener, summarize_symbols, sweep_runner, upgrade)
+    rng = np.random.default_rng(0)
+    names = [f'S{number:04d}' for number in range(int(symbols))]
+    days = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=bars).date
+    with app.app_context():
+        upgrade()
+        for name in names:
+            close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+            volume = rng.integers(100_000, 1_000_000, bars)
+            if rng.random() < 0.1:
+                volume[-1] *= 4  # some symbols end on a volume spike
+            db.session.execute(insert(DailyBar), [
+                {'symbol': name, 'date': day, 'open': price, 'high': price * 1.01, 'low': price * 0.99, 'close': price, 'volume': int(shares)}
+                for day, price, shares in zip(days, close.tolist(), volume.tolist())
+            ])
+        db.session.add_all(PriceHistory(symbol=name, has_full_history=False, last_synced=datetime.utcnow()) for name in names)
+        db.session.commit()
+        
+        start = time.perf_counter()
+        summarize_symbols(names)
+        per_symbol = time.perf_counter() - start
+        start = time.perf_counter()
+        screener.backfill()
+        backfill = time.perf_counter() - start
+        start = time.perf_counter()
+        screener.table()
+        load = time.perf_counter() - start
+        expression = 'close > sma_200 and volume > 2 * avg_volume_20'
+        screen = best_of(lambda: screener.screen(expression, '-volume_ratio'))
+        matched = screener.screen(expression)[1]
+    sweep_runner.executor and sweep_runner.executor.shutdown()
+    print(json.dumps({'per_symbol': per_symbol, 'backfill': backfill, 'load': load, 'screen': screen,
+                      'matched': matched, 'workers': sweep_runner.workers}))
+
+def bench_screener(symbols=2000):
+    counts = run_worker('screener', symbols, {})
+    report(f"Screening {symbols:,} symbols for 'close > sma_200 and volume > 2 * avg_volume_20' ({counts['matched']} match)", [
+        ('read + summarize, in process', counts['per_symbol'], None),
+        (f"summary backfill ({counts['workers']} workers)", counts['backfill'], counts['per_symbol']),
+        ('load summaries (first screen)', counts['load'], counts['per_symbol']),
+        ('screen precomputed summaries', counts['screen'], counts['per_symbol']),
+    ])
+
+def run_worker(name, amount, overrides):
+    """Run a load worker in a fresh process against a throwaway database and return its counts
+    
+    amount is the worker's one argument: seconds of load, or the number of symbols for the screener.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, QUOTE_REFRESHER='off', DATABASE_URL=f"sqlite:///{directory}/load.db",
+                   RATE_LIMIT_DB=os.path.join(directory, 'rate_limit.db'), BAR_FILES_DIR=os.path.join(directory, 'bars'))
+        env.update(overrides)
+        output = subprocess.run([sys.executable, __file__, '--worker', name, str(amount)], env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def bench_quote_writes(seconds=5):
+    print(f"\nQuote page views for {seconds}s, 8 threads, cached quotes")
+    for label, overrides in [('commit per view', {'PRICE_FLUSH_INTERVAL': '0'}), ('coalesced (defaults)', {})]:
+        counts = run_worker('quotes', seconds, overrides)
+        print(f"  {label:<34} {counts['requests'] / seconds:8.1f} views/s {counts['commits'] / seconds:8.1f} write commits/s  "
+              f"final prices stored: {counts['stored']}/{counts['symbols']}")
+
+def bench_db(seconds=5):
+    configs = [
+        ('rollback journal (old defaults)', {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+                                             'SQLITE_BUSY_TIMEOUT_MS': '5000', 'DB_POOL_SIZE': '5', 'DB_MAX_OVERFLOW': '10'}),
+        ('WAL + busy_timeout (defaults)', {}),
+    ]
+    if os.environ.get('BENCH_POSTGRES_URL'):
+        configs.append(('Postgres', {'DATABASE_URL': os.environ['BENCH_POSTGRES_URL']}))
+    
+    print(f"\nConcurrent load for {seconds}s: 8 transaction writers, 8 portfolio readers, 1 quote updater")
+    for label, overrides in configs:
+        counts = run_worker('db', seconds, overrides)
+        print(f"  {label:<34} {counts['writes'] / seconds:8.1f} writes/s {counts['reads'] / seconds:8.1f} reads/s "
+              f"{counts['quote_updates'] / seconds:6.1f} quote batches/s  locked: {counts['locked']}  other errors: {counts['errors']}")
+
+def bench_load(seconds=10):
+    # Upstream calls cost a realistic round trip but are never rate limited, so the numbers are the app's own
+    counts = run_worker('load', seconds, {'MARKET_DATA_SOURCE': 'replay', 'REPLAY_LATENCY_MS': '50', 'REPLAY_JITTER_MS': '25',
+                                          'ALPHA_VANTAGE_RPM': '1000000', 'ALPHA_VANTAGE_BURST': '10000'})
+    print(f"\nLoad test for {seconds}s: {counts['users']} users via {counts['target']}, replayed market data at 50±25 ms")
+    for action, row in counts['endpoints'].items():
+        print(f"  {action:<34} {row['requests'] / seconds:8.1f} req/s  p50 {row['p50'] * 1000:8.2f} ms  "
+              f"p99 {row['p99'] * 1000:8.2f} ms  errors: {row['errors']}")
+
+BENCHMARKS = {
+    'indicators': bench_indicators,
+    'bars': bench_bar_files,
+    'backtest': bench_backtest,
+    'db': bench_db,
+    'alerts': bench_alerts,
+    'quotes': bench_quote_writes,
+    'screener': bench_screener,
+    'load': bench_load,
+}
+
+WORKERS = {
+    'db': db_load_worker,
+    'quotes': quote_load_worker,
+    'screener': screener_worker,
+    'load': load_worker,
+}
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--worker']:
+        WORKERS[sys.argv[2]](float(sys.argv[3]))
+    else:
+        for name in sys.argv[1:] or list(BENCHMARKS):
+            BENCHMARKS[name]()
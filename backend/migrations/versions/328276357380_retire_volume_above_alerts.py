@@ -0,0 +1,35 @@
+"""Retire volume_above alerts
+
+volume_above compared the day's volume with an absolute share count, which fires for every liquid
+symbol. It was replaced by volume_spike, a multiple of the average daily volume, and an absolute
+threshold can't be translated into one, so active volume_above alerts are deactivated.
+
+Revision ID: 328276357380
+Revises: cec01b39551f
+Create Date: 2026-10-17 05:19:55.760128
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '328276357380'
+down_revision = 'cec01b39551f'
+branch_labels = None
+depends_on = None
+
+price_alert = sa.table('price_alert',
+    sa.column('kind', sa.String), sa.column('active', sa.Boolean), sa.column('updated_at', sa.DateTime))
+
+
+def upgrade():
+    op.execute(price_alert.update()
+               .where(price_alert.c.kind == 'volume_above', price_alert.c.active.is_(True))
+               .values(active=False, updated_at=datetime.utcnow()))
+
+
+def downgrade():
+    pass
@@ -0,0 +1,60 @@
+"""Backfill holdings
+
+Holding rows were only written by add_transaction and the import from the start, so databases
+upgraded from before the table existed had transactions but empty portfolios. Positions are
+derived data, so every user's rows are rebuilt from the full history (what `flask rebuild-holdings` does).
+
+Revision ID: cec01b39551f
+Revises: 9c242d117b65
+Create Date: 2026-10-17 05:11:48.464105
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cec01b39551f'
+down_revision = '9c242d117b65'
+branch_labels = None
+depends_on = None
+
+transaction = sa.table('transaction',
+    sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('symbol', sa.String),
+    sa.column('type', sa.String), sa.column('quantity', sa.Integer), sa.column('price', sa.Float),
+    sa.column('date', sa.DateTime))
+holding = sa.table('holding',
+    sa.column('user_id', sa.Integer), sa.column('symbol', sa.String), sa.column('quantity', sa.Integer),
+    sa.column('total_cost', sa.Float), sa.column('realized_pnl', sa.Float), sa.column('last_transaction_date', sa.DateTime))
+
+
+def upgrade():
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(transaction.c.user_id, transaction.c.symbol, transaction.c.type,
+                                        transaction.c.quantity, transaction.c.price, transaction.c.date)
+                              .order_by(transaction.c.user_id, transaction.c.symbol, transaction.c.date, transaction.c.id))
+    
+    # Average cost, folded the same way as Holding.apply (models can't be imported from a migration)
+    positions = {}
+    for user_id, symbol, kind, quantity, price, date in rows:
+        position = positions.setdefault((user_id, symbol), {
+            'user_id': user_id, 'symbol': symbol, 'quantity': 0, 'total_cost': 0.0, 'realized_pnl': 0.0,
+            'last_transaction_date': None})
+        if kind == 'buy':
+            position['quantity'] += quantity
+            position['total_cost'] += quantity * price
+        else:
+            avg_cost = position['total_cost'] / position['quantity'] if position['quantity'] > 0 else 0
+            position['realized_pnl'] += quantity * (price - avg_cost)
+            position['quantity'] -= quantity
+            position['total_cost'] = position['quantity'] * avg_cost if position['quantity'] > 0 else 0
+        position['last_transaction_date'] = date  # rows arrive in date order
+    
+    op.execute(holding.delete())
+    values = list(positions.values())
+    for start in range(0, len(values), 1000):
+        connection.execute(holding.insert(), values[start:start + 1000])
+
+
+def downgrade():
+    pass  # holdings are derived data; nothing to undo
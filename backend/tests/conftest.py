@@ -0,0 +1,41 @@
+"""Shared fixtures: every test session runs against a throwaway database and instance directory"""
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+DATA_DIR = tempfile.mkdtemp(prefix='stocksim-tests-')
+os.environ.update({
+    'DATABASE_URL': f"sqlite:///{os.path.join(DATA_DIR, 'test.db')}",
+    'RATE_LIMIT_DB': os.path.join(DATA_DIR, 'rate_limit.db'),
+    'BAR_FILES_DIR': os.path.join(DATA_DIR, 'bars'),
+    'QUOTE_REFRESHER': 'off',
+    'MARKET_DATA_SOURCE': 'replay',  # never reach the real API
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+usernames = (f'user{number}' for number in itertools.count())
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app, upgrade
+    with app.app_context():
+        upgrade()
+    yield app
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def user_client(app):
+    """A test client logged in as a fresh user; the user's id is on client.user_id"""
+    client = app.test_client()
+    response = client.post('/api/register', json={'username': next(usernames), 'password': 'password123'})
+    assert response.status_code == 201
+    client.user_id = response.get_json()['user']['id']
+    return client
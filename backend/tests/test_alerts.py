@@ -0,0 +1,52 @@
+"""Price alerts fire when a quote crosses their threshold, volume spikes against the average daily volume"""
+from datetime import date, timedelta
+
+import pytest
+
+from app import DailyBar, db, response_cache
+
+def publish(app, symbol, price, volume=1000):
+    """Store a fresh quote the way the API client does"""
+    with app.app_context():
+        response_cache._store('quote', symbol, {'symbol': symbol, 'price': price, 'change_percent': '0', 'volume': volume})
+
+def create_alert(client, symbol, kind, threshold):
+    response = client.post('/api/alerts', json={'symbol': symbol, 'kind': kind, 'threshold': threshold})
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['alert']['id']
+
+def triggered(client):
+    return {alert['id']: alert['triggered_value'] for alert in client.get('/api/alerts?status=triggered').get_json()['alerts']}
+
+def test_price_alert_fires_on_crossing_only(app, user_client):
+    publish(app, 'ALRA', 110)
+    above = create_alert(user_client, 'ALRA', 'price_above', 100)
+    below = create_alert(user_client, 'ALRA', 'price_below', 100)
+
+    publish(app, 'ALRA', 120)  # already above when the alert was created: not a crossing
+    assert triggered(user_client) == {}
+
+    publish(app, 'ALRA', 95)
+    assert triggered(user_client) == {below: 95}
+    publish(app, 'ALRA', 100)
+    assert triggered(user_client) == {below: 95, above: 100}
+
+def test_volume_spike_is_relative_to_average_volume(app, user_client):
+    with app.app_context():
+        today = date.today()
+        db.session.add_all(DailyBar(symbol='ALRB', date=today - timedelta(days=day), open=10, high=10, low=10, close=10,
+                                    volume=2000 if day <= 20 else 10**9)  # older bars are outside the window
+                           for day in range(1, 31))
+        db.session.commit()
+    publish(app, 'ALRB', 10, volume=500)
+    spike = create_alert(user_client, 'ALRB', 'volume_spike', 3)
+
+    publish(app, 'ALRB', 10, volume=5000)
+    assert triggered(user_client) == {}
+    publish(app, 'ALRB', 10, volume=7000)
+    assert triggered(user_client) == {spike: pytest.approx(3.5)}
+
+@pytest.mark.parametrize('kind, threshold', [('volume_above', 1000), ('volume_spike', 0)])
+def test_invalid_alerts_are_rejected(user_client, kind, threshold):
+    response = user_client.post('/api/alerts', json={'symbol': 'ALRC', 'kind': kind, 'threshold': threshold})
+    assert response.status_code == 400
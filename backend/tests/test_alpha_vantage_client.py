@@ -0,0 +1,100 @@
+"""AlphaVantageClient against a local stub of the query API: parsing, retries and timeouts"""
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+import app as stocksim
+from app import AlphaVantageClient, RateLimitExceeded, TokenBucket
+
+CANNED = {
+    'GLOBAL_QUOTE': {'Global Quote': {
+        '01. symbol': 'IBM', '02. open': '181.0000', '03. high': '184.1000', '04. low': '180.5000',
+        '05. price': '183.2500', '06. volume': '3456789', '07. latest trading day': '2024-06-11',
+        '08. previous close': '181.7500', '09. change': '1.5000', '10. change percent': '0.8253%'}},
+    'TIME_SERIES_DAILY': {'Meta Data': {'2. Symbol': 'IBM'}, 'Time Series (Daily)': {
+        '2024-06-11': {'1. open': '181.0', '2. high': '184.1', '3. low': '180.5', '4. close': '183.25', '5. volume': '3456789'},
+        '2024-06-10': {'1. open': '180.0', '2. high': '182.0', '3. low': '179.0', '4. close': '181.75', '5. volume': '2345678'},
+        '2024-06-07': {'1. open': '178.0', '2. high': '180.5', '3. low': '177.5', '4. close': '180.00', '5. volume': '1234567'}}},
+}
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = dict(parse_qsl(urlsplit(self.path).query))
+        self.server.calls[params['function']] += 1
+        status, delay = self.server.script.pop(0) if self.server.script else (200, 0)
+        time.sleep(delay)
+        body = json.dumps(CANNED[params['function']] if status == 200 else {'error': 'stub'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub():
+    """A local query endpoint; append (status, delay) pairs to server.script to control the next responses"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.calls = defaultdict(int)
+    server.script = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Record the jittered backoff ceilings instead of sleeping through them"""
+    ceilings = []
+    monkeypatch.setattr(stocksim.random, 'uniform', lambda low, high: ceilings.append(high) or 0)
+    return ceilings
+
+def make_client(stub, tmp_path, tokens=100):
+    client = AlphaVantageClient()
+    client.base_url = f'http://127.0.0.1:{stub.server_port}/query'
+    client.use_demo_quotes = False
+    client.timeout = (1, 0.5)
+    # A bucket that never refills within the test, so every token spent is visible
+    client.rate_limiter = TokenBucket(str(tmp_path / 'tokens.db'), requests_per_minute=0.001, capacity=tokens)
+    return client
+
+def test_parses_quote_and_daily_series(stub, tmp_path):
+    client = make_client(stub, tmp_path)
+    assert client.get_stock_quote('IBM') == {
+        'symbol': 'IBM', 'price': 183.25, 'change': 1.5, 'change_percent': '0.8253', 'volume': 3456789,
+        'latest_trading_day': '2024-06-11', 'previous_close': 181.75}
+    
+    frame = client.get_daily_frame('IBM')
+    assert [day.strftime('%Y-%m-%d') for day in frame.index] == ['2024-06-07', '2024-06-10', '2024-06-11']
+    assert frame['close'].tolist() == [180.0, 181.75, 183.25]
+    assert frame['volume'].dtype == 'int64'
+
+def test_retries_with_backoff_after_429_and_5xx(stub, tmp_path, backoffs):
+    client = make_client(stub, tmp_path)
+    stub.script += [(429, 0), (503, 0)]
+    assert client.get_stock_quote('IBM')['price'] == 183.25
+    assert stub.calls['GLOBAL_QUOTE'] == 3
+    assert backoffs == [0.5, 1.0]
+
+def test_each_retry_spends_a_token(stub, tmp_path, backoffs):
+    client = make_client(stub, tmp_path, tokens=2)
+    stub.script += [(429, 0), (429, 0), (429, 0)]
+    with pytest.raises(RateLimitExceeded):
+        client.get_stock_quote('IBM')
+    assert stub.calls['GLOBAL_QUOTE'] == 2
+
+def test_gives_up_after_repeated_timeouts(stub, tmp_path, backoffs):
+    client = make_client(stub, tmp_path)
+    client.timeout = (1, 0.05)
+    stub.script += [(200, 0.2)] * (client.max_retries + 1)
+    assert client.get_stock_quote('IBM') is None
+    assert stub.calls['GLOBAL_QUOTE'] == client.max_retries + 1
+    assert backoffs == [0.5, 1.0, 2.0]
@@ -0,0 +1,20 @@
+"""Logins: the user cache forgets a user on logout, unknown users cost one hash like everyone else"""
+from werkzeug.security import check_password_hash
+
+from app import PasswordHasher, user_cache
+
+def test_logout_evicts_cached_user(user_client):
+    assert user_client.get('/api/me').status_code == 200
+    assert user_client.user_id in user_cache.entries
+
+    assert user_client.post('/api/logout').status_code == 200
+    assert user_client.user_id not in user_cache.entries
+    assert user_client.get('/api/me').status_code == 401
+
+def test_unknown_user_is_checked_against_dummy_hash(monkeypatch):
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    assert hasher.dummy_hash
+    calls = []
+    monkeypatch.setattr(hasher, 'run', lambda fn, *args: calls.append(fn) or fn(*args))
+    assert hasher.verify(None, 'password123') is False
+    assert calls == [check_password_hash]
@@ -0,0 +1,59 @@
+"""Backtest engine: the vectorized simulation against a bar-by-bar reference, and sweeps across processes"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import SweepRunner, run_backtest, sweep_chunk
+
+def random_walk(symbols=1, bars=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2015-01-02', periods=bars, name='date')
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (bars, symbols)), axis=0))
+    open_ = close * (1 + rng.normal(0, 0.003, (bars, symbols)))
+    columns = [f'S{number}' for number in range(symbols)]
+    return pd.DataFrame(open_, index=index, columns=columns), pd.DataFrame(close, index=index, columns=columns)
+
+def reference_crossover(opens, closes, fast, slow, cash=10000.0):
+    """Single-symbol SMA crossover stepped bar by bar, all in on the open after a fast > slow close"""
+    shares, signal, equity = 0, False, []
+    for i in range(len(closes)):
+        if i and signal and not shares:
+            shares = math.floor(cash / opens[i])
+            cash -= shares * opens[i]
+        elif i and not signal and shares:
+            cash += shares * opens[i]
+            shares = 0
+        if i >= slow - 1:
+            signal = sum(closes[i - fast + 1:i + 1]) / fast > sum(closes[i - slow + 1:i + 1]) / slow
+        equity.append(cash + shares * closes[i])
+    return equity
+
+@pytest.mark.parametrize('fast, slow', [(20, 50), (5, 200)])
+def test_crossover_matches_bar_by_bar_reference(fast, slow):
+    opens, closes = random_walk()
+    equity, orders, stats = run_backtest('sma_crossover', opens, closes, {'fast': fast, 'slow': slow})
+    expected = reference_crossover(opens['S0'].tolist(), closes['S0'].tolist(), fast, slow)
+    np.testing.assert_allclose(equity.to_numpy(), expected, rtol=0, atol=1e-6)
+    assert stats['trades'] == len(orders) > 0
+    assert [order['type'] for order in orders[:2]] == ['buy', 'sell']
+
+def test_dca_invests_every_contribution():
+    opens, closes = random_walk(symbols=3, bars=252)
+    _, orders, stats = run_backtest('dca', opens, closes, {'amount': 500, 'every': 21})
+    assert stats['invested'] == 10000 + 500 * 12  # one contribution every 21 of 252 bars
+    assert {order['date'][:10] for order in orders} <= set(closes.index[::21].strftime('%Y-%m-%d'))
+
+def test_sweep_across_processes_matches_sequential_runs():
+    opens, closes = random_walk(symbols=2, bars=600)
+    grid = {'fast': [5, 10, 20], 'slow': [50, 100]}
+    param_sets = [{'fast': fast, 'slow': slow} for fast in grid['fast'] for slow in grid['slow']]
+    runner = SweepRunner(2)
+    try:
+        pooled = runner.run('sma_crossover', opens, closes, grid)
+    finally:
+        runner.pool().shutdown()
+    sequential = sweep_chunk('sma_crossover', opens, closes, param_sets, 10000)
+    key = lambda result: (result[0]['fast'], result[0]['slow'])
+    assert sorted(pooled, key=key) == sorted(sequential, key=key)
@@ -0,0 +1,81 @@
+"""Memory-mapped bar files: reads, rewrites and the bound on open mappings"""
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as stocksim
+from app import BarFileStore, PriceHistory, bar_files, bars_to_frame, db, price_store
+
+def frame(days, start='2024-01-01', price=10.0):
+    index = pd.bdate_range(start, periods=days, name='date')
+    close = np.linspace(price, price * 2, days)
+    return pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close,
+                         'volume': np.arange(days, dtype='int64')}, index=index)
+
+def open_descriptors():
+    return len(os.listdir('/proc/self/fd'))
+
+def test_slice_and_rewrite(tmp_path):
+    store = BarFileStore(str(tmp_path))
+    store.write('AAA', frame(10))
+    bars = store.slice('AAA', date(2024, 1, 3), date(2024, 1, 5))
+    assert list(bars_to_frame(bars).index.day) == [3, 4, 5]
+    
+    store.write('AAA', frame(20))
+    assert len(store.slice('AAA')) == 20
+    assert store.slice('MISSING') is None
+
+def test_write_tail_extends_in_place(tmp_path):
+    store = BarFileStore(str(tmp_path))
+    store.write('AAA', frame(10))
+    inode = os.stat(store.path('AAA')).st_ino
+    
+    tail = frame(12).iloc[9:]  # revises the last stored bar and adds two
+    assert store.write_tail('AAA', tail)
+    assert os.stat(store.path('AAA')).st_ino == inode
+    stored = bars_to_frame(store.slice('AAA'))
+    pd.testing.assert_frame_equal(stored.iloc[:9], frame(10).iloc[:9], check_freq=False, check_index_type=False)
+    pd.testing.assert_frame_equal(stored.iloc[9:], tail, check_freq=False, check_index_type=False)
+    
+    assert not store.write_tail('AAA', frame(3, start='2025-01-01'))  # gap after the stored bars
+    assert not store.write_tail('AAA', frame(12).iloc[5:8])  # would leave older bars after it
+    assert not store.write_tail('MISSING', tail)
+    assert len(store.slice('AAA')) == 12
+
+def test_compact_sync_only_writes_the_tail(app, monkeypatch):
+    # Ending today, so the second sync is a compact delta rather than a gap that needs the full series
+    start = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=302)[0]
+    responses = [frame(300, start), frame(302, start).iloc[-100:]]
+    monkeypatch.setattr(stocksim.api_client, 'get_daily_frame', lambda symbol, outputsize, priority: responses.pop(0))
+    with app.app_context():
+        assert price_store.sync('TAIL', full=True)
+        db.session.get(PriceHistory, 'TAIL').last_synced = pd.Timestamp('2000-01-01').to_pydatetime()
+        db.session.commit()
+        
+        def rewrite(symbol, frame):
+            raise AssertionError('compact sync rewrote the whole bar file')
+        monkeypatch.setattr(bar_files, 'write', rewrite)
+        assert price_store.sync('TAIL', full=True)
+        
+        stored = bars_to_frame(bar_files.slice('TAIL'))
+        assert len(stored) == 302
+        pd.testing.assert_frame_equal(stored, price_store.read_table('TAIL'), check_dtype=False, check_index_type=False)
+
+def test_open_mappings_are_bounded(tmp_path):
+    if not os.path.isdir('/proc/self/fd'):
+        pytest.skip('needs /proc to count file descriptors')
+    store = BarFileStore(str(tmp_path), max_open=4)
+    symbols = [f'S{number}' for number in range(50)]
+    for symbol in symbols:
+        store.write(symbol, frame(5))
+    
+    before = open_descriptors()
+    for symbol in symbols:
+        assert len(store.slice(symbol)) == 5
+    assert len(store.maps) == 4
+    assert open_descriptors() - before <= 4
+    # Evicted symbols map again on demand
+    assert float(store.slice('S0')['close'][0]) == 10.0
@@ -0,0 +1,24 @@
+"""Engine options must be accepted by the pool SQLAlchemy picks for each URL"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import engine_options
+
+@pytest.mark.parametrize('url', ['sqlite://', 'sqlite:///:memory:', 'sqlite:///file:shared?mode=memory&cache=shared&uri=true'])
+def test_in_memory_sqlite_urls_start(url):
+    engine = create_engine(url, **engine_options(url))
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT 1')).scalar() == 1
+    engine.dispose()
+
+def test_file_sqlite_keeps_pool_sizing(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url))
+    assert engine.pool.size() == engine_options(url)['pool_size']
+    engine.dispose()
+
+def test_upgrade_from_another_directory(app, tmp_path, monkeypatch):
+    from app import upgrade
+    monkeypatch.chdir(tmp_path)
+    with app.app_context():
+        upgrade()
@@ -0,0 +1,77 @@
+"""Portfolio performance: time/money-weighted returns on a hand-computed history, and the cached tail recompute"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as stocksim
+from app import portfolio_history
+
+CLOSES = pd.Series([10.0, 11.0, 12.0, 12.0], index=pd.DatetimeIndex(
+    ['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'], name='date'), name='close')
+
+@pytest.fixture
+def prices(monkeypatch):
+    def get_frame(symbol, full=False, start=None, end=None, priority='interactive'):
+        closes = CLOSES
+        if start:
+            closes = closes[closes.index >= pd.Timestamp(start)]
+        if end:
+            closes = closes[closes.index <= pd.Timestamp(end)]
+        return closes.to_frame()
+    monkeypatch.setattr(stocksim.price_store, 'get_frame', get_frame)
+
+def trade(client, kind, quantity, price, day):
+    response = client.post('/api/portfolio/transaction', json={
+        'symbol': 'PERF', 'type': kind, 'quantity': quantity, 'price': price, 'date': f'{day}T15:00:00'})
+    assert response.status_code == 201, response.get_json()
+
+def performance(client, **params):
+    response = client.get('/api/portfolio/performance', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_returns_with_a_deposit_mid_period(user_client, prices):
+    trade(user_client, 'buy', 10, 10.0, '2024-01-02')
+    trade(user_client, 'buy', 10, 12.0, '2024-01-04')  # 120 more invested after a 10% gain
+    body = performance(user_client)
+    
+    assert [row['value'] for row in body['data']] == [100, 110, 240, 240]
+    assert [row['net_flow'] for row in body['data']] == [100, 0, 120, 0]
+    # Daily returns net of flows: 0, 110/100 - 1, (240 - 120)/110 - 1, 0, which chain to 12/10 - 1
+    assert [row['time_weighted_return'] for row in body['data']] == pytest.approx([0, 0.1, 0.2, 0.2], abs=1e-4)
+    summary = body['summary']
+    assert summary['time_weighted_return'] == pytest.approx(0.2)
+    assert (summary['end_value'], summary['cost_basis'], summary['net_flows']) == (240, 220, 220)
+    
+    # -100 on day 0, -120 on day 2, +240 on day 3; with x the daily growth factor, 5x^3 + 6x - 12 = 0
+    growth = next(root.real for root in np.roots([5, 0, 6, -12]) if abs(root.imag) < 1e-12)
+    assert summary['money_weighted_return'] == pytest.approx(growth ** 3 - 1, abs=1e-4)
+    assert summary['money_weighted_return_annualized'] == pytest.approx(growth ** 365 - 1, rel=1e-3)
+    
+    # A later start carries the position in as money invested on its first day
+    later = performance(user_client, start='2024-01-03')['summary']
+    assert later['start_value'] == 100
+    assert later['time_weighted_return'] == pytest.approx(0.2)
+
+def test_back_dated_trade_recomputes_only_the_tail(user_client, prices, monkeypatch):
+    trade(user_client, 'buy', 10, 10.0, '2024-01-02')
+    trade(user_client, 'buy', 10, 12.0, '2024-01-05')
+    performance(user_client)
+    
+    recomputed_from = []
+    compute = portfolio_history.compute
+    def spy(user_id, entry, from_day):
+        recomputed_from.append(from_day)
+        return compute(user_id, entry, from_day)
+    monkeypatch.setattr(portfolio_history, 'compute', spy)
+    
+    trade(user_client, 'sell', 5, 11.0, '2024-01-03')
+    incremental = performance(user_client)
+    assert recomputed_from == [pd.Timestamp('2024-01-03')]
+    
+    portfolio_history.entries.clear()
+    rebuilt = performance(user_client)
+    assert recomputed_from[-1] is None
+    assert incremental == rebuilt
+    assert [row['value'] for row in rebuilt['data']] == [100, 55, 60, 180]
@@ -0,0 +1,80 @@
+"""Portfolio risk: covariance, VaR/CVaR and beta on known return series, and request validation"""
+import statistics
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as stocksim
+from app import risk_metrics
+
+MARKET_RETURNS = np.array([0.01, -0.02, 0.015, 0.003, -0.007, 0.012, -0.004, 0.008, -0.011, 0.006,
+                           0.002, -0.009, 0.014, -0.003, 0.005, -0.006, 0.011, -0.001, 0.004, -0.013])
+
+def closes_from(returns, start=100.0):
+    return start * np.cumprod(np.concatenate([[1.0], 1 + np.asarray(returns)]))
+
+def frame(columns):
+    days = pd.bdate_range('2024-01-01', periods=len(next(iter(columns.values()))), name='date')
+    return pd.DataFrame(columns, index=days)
+
+def test_covariance_and_beta_of_scaled_returns():
+    market = closes_from(MARKET_RETURNS)
+    # Twice the market's moves, and the opposite of them
+    closes = frame({'LEV': closes_from(2 * MARKET_RETURNS, 50.0), 'INV': closes_from(-MARKET_RETURNS, 25.0)})
+    report = risk_metrics(closes, np.array([2.0, 4.0]), pd.Series(market, index=closes.index))
+    
+    variance = statistics.variance(MARKET_RETURNS)
+    assert np.array(report['covariance']['matrix']) == pytest.approx(
+        np.array([[4, -2], [-2, 1]]) * variance, abs=1e-8)
+    assert report['correlation']['matrix'] == [[1.0, -1.0], [-1.0, 1.0]]
+    assert [holding['beta'] for holding in report['holdings']] == [2.0, -1.0]
+    
+    weights = [holding['weight'] for holding in report['holdings']]
+    assert sum(weights) == pytest.approx(1)
+    assert report['beta'] == pytest.approx(2 * weights[0] - weights[1], abs=1e-4)
+    assert report['observations'] == len(MARKET_RETURNS)
+
+def test_historical_and_parametric_var():
+    returns = [-0.10, -0.05] + [0.01] * 18
+    report = risk_metrics(frame({'ONE': closes_from(returns)}), np.array([10.0]), confidence=0.95)
+    
+    # 5% quantile of 20 returns sits 0.95 of the way from the worst (-0.10) to the next (-0.05)
+    assert report['var']['historical']['return'] == pytest.approx(0.0525)
+    assert report['cvar']['historical']['return'] == pytest.approx(0.10)
+    
+    mean, sigma = statistics.mean(returns), statistics.stdev(returns)
+    z = NormalDist().inv_cdf(0.05)
+    assert report['var']['parametric']['return'] == pytest.approx(-(mean + z * sigma), abs=1e-6)
+    assert report['cvar']['parametric']['return'] == pytest.approx(-(mean - sigma * NormalDist().pdf(z) / 0.05), abs=1e-6)
+    assert report['var']['historical']['amount'] == pytest.approx(0.0525 * report['value'], abs=0.01)
+    assert report['beta'] is None
+
+def test_risk_route_reports_beta_against_benchmark(user_client, monkeypatch):
+    days = pd.bdate_range(end='2024-06-28', periods=len(MARKET_RETURNS) + 1, name='date')
+    series = {'RSK': closes_from(2 * MARKET_RETURNS), 'SPY': closes_from(MARKET_RETURNS)}
+    def get_frame(symbol, full=False, start=None, end=None, priority='interactive'):
+        closes = pd.Series(series[symbol], index=days, name='close')
+        return closes[(closes.index >= pd.Timestamp(start)) & (closes.index <= pd.Timestamp(end))].to_frame()
+    monkeypatch.setattr(stocksim.price_store, 'get_frame', get_frame)
+    
+    assert user_client.post('/api/portfolio/transaction', json={
+        'symbol': 'RSK', 'type': 'buy', 'quantity': 3, 'price': 100, 'date': '2024-01-02T10:00:00'}).status_code == 201
+    response = user_client.get('/api/portfolio/risk?as_of=2024-06-28&lookback=20&benchmark=spy')
+    assert response.status_code == 200, response.get_json()
+    risk = response.get_json()['risk']
+    assert (risk['benchmark'], risk['beta'], risk['observations']) == ('SPY', 2.0, 20)
+
+@pytest.mark.parametrize('query, message', [
+    ('confidence=abc', 'confidence must be a number at least 0.5 and below 1'),
+    ('confidence=1', 'confidence must be a number at least 0.5 and below 1'),
+    ('confidence=nan', 'confidence must be a number at least 0.5 and below 1'),
+    ('lookback=1.5', 'lookback must be a whole number of days between 20 and 2520'),
+    ('lookback=5', 'lookback must be a whole number of days between 20 and 2520'),
+    ('as_of=yesterday', 'Invalid as_of date. Use YYYY-MM-DD'),
+])
+def test_invalid_parameters_are_rejected(user_client, query, message):
+    response = user_client.get(f'/api/portfolio/risk?{query}')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': message}
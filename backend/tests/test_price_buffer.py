@@ -0,0 +1,60 @@
+"""Coalesced Stock price writes: buffered reads, batched flushes and re-queueing after a failed commit"""
+from datetime import datetime
+
+import pytest
+
+import app as stocksim
+from app import PriceWriteBuffer, Stock, db
+
+@pytest.fixture
+def buffer(monkeypatch):
+    price_buffer = PriceWriteBuffer(interval=60, max_pending=3)
+    monkeypatch.setattr(price_buffer, 'start', lambda: None)  # flushed by hand, no writer thread
+    return price_buffer
+
+def stored(app, symbol):
+    with app.app_context():
+        stock = db.session.get(Stock, symbol)
+        return stock.last_price if stock else None
+
+def test_buffered_prices_are_read_before_and_written_in_one_flush(app, buffer):
+    buffer.record('PWA', 10.0)
+    buffer.record_many({'PWB': 20.0, 'PWA': 11.0})
+    assert buffer.latest('PWA')[0] == 11.0
+    # An older stored value loses to the buffered one, a newer one wins
+    assert buffer.latest('PWA', 9.0, datetime(2000, 1, 1))[0] == 11.0
+    assert buffer.latest('PWA', 12.0, datetime(2100, 1, 1))[0] == 12.0
+    assert stored(app, 'PWA') is None
+    
+    assert buffer.flush() == 2
+    assert (stored(app, 'PWA'), stored(app, 'PWB')) == (11.0, 20.0)
+    assert buffer.get_stats() == {'recorded': 3, 'flushes': 1, 'rows_written': 2, 'failed_flushes': 0, 'pending': 0}
+
+def test_failed_flush_requeues_without_overwriting_newer_prices(app, buffer, monkeypatch):
+    buffer.record_many({'PWC': 30.0, 'PWD': 40.0})
+    
+    def failing_save(prices, updated_at=None):
+        assert buffer.latest('PWC')[0] == 30.0  # readers still see the batch being written
+        buffer.record('PWC', 31.0)  # recorded while the flush is in progress
+        raise RuntimeError('database is locked')
+    with monkeypatch.context() as patch:
+        patch.setattr(stocksim, 'save_stock_prices', failing_save)
+        assert buffer.flush() == 0
+    assert buffer.get_stats()['failed_flushes'] == 1
+    assert buffer.pending.keys() == {'PWC', 'PWD'}
+    assert buffer.latest('PWC')[0] == 31.0
+    
+    assert buffer.flush() == 2
+    assert (stored(app, 'PWC'), stored(app, 'PWD')) == (31.0, 40.0)
+
+def test_size_threshold_wakes_the_writer(buffer):
+    buffer.record_many({'PWE': 1.0, 'PWF': 2.0})
+    assert not buffer.wakeup.is_set()
+    buffer.record('PWG', 3.0)
+    assert buffer.wakeup.is_set()
+
+def test_zero_interval_writes_through(app):
+    buffer = PriceWriteBuffer(interval=0, max_pending=100)
+    buffer.record('PWH', 5.0)
+    assert buffer.pending == {}
+    assert stored(app, 'PWH') == 5.0
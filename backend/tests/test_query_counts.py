@@ -0,0 +1,41 @@
+"""The portfolio and watchlist endpoints must not go back to one query per row"""
+import pytest
+from sqlalchemy import event
+
+from app import Holding, Stock, Watchlist, db
+
+def seed(app, user_id, rows):
+    with app.app_context():
+        for number in range(rows):
+            symbol = f'QC{user_id}X{number}'
+            db.session.add(Stock(symbol=symbol, name=symbol, last_price=10.0 + number))
+            db.session.add(Holding(user_id=user_id, symbol=symbol, quantity=5, total_cost=50.0, realized_pnl=0))
+            db.session.add(Watchlist(user_id=user_id, symbol=symbol))
+        db.session.commit()
+
+def count_statements(app, client, path):
+    statements = []
+    def count(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert response.status_code == 200
+    return len(statements)
+
+@pytest.mark.parametrize('path', ['/api/portfolio', '/api/watchlist'])
+def test_query_count_does_not_grow_with_rows(app, path):
+    counts = []
+    for rows in (1, 5, 25):
+        client = app.test_client()
+        user_id = client.post('/api/register', json={'username': f'qc-{path.split("/")[-1]}-{rows}',
+                                                     'password': 'password123'}).get_json()['user']['id']
+        seed(app, user_id, rows)
+        client.get(path)  # warm per-process caches so only the endpoint's own queries are counted
+        counts.append(count_statements(app, client, path))
+    assert counts[0] == counts[1] == counts[2], f'{path} ran {counts} statements for 1, 5 and 25 rows'
@@ -0,0 +1,77 @@
+"""Quote streams under gunicorn's gevent worker: one worker process serves many open streams at once"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+
+from app import response_cache
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STREAMS = 20
+
+def publish(app, symbol, price):
+    """Store a fresh quote the way the API client does; the server process picks it up through its relay"""
+    with app.app_context():
+        response_cache._store('quote', symbol, {'symbol': symbol, 'price': price})
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def server(app):
+    """A single gevent worker sharing the test database; yields its base URL"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-k', 'gevent', '-w', '1', '--worker-connections', '100',
+         '--graceful-timeout', '1', '-b', f'127.0.0.1:{port}', 'app:create_app()'],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                requests.get(f'{url}/api/me', timeout=5)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.2)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def next_quote(lines):
+    for line in lines:
+        if line.startswith(b'data: '):
+            return json.loads(line[len(b'data: '):])['quote']
+
+def test_one_worker_serves_many_concurrent_streams(app, server):
+    session = requests.Session()
+    response = session.post(f'{server}/api/register', json={'username': 'streamer', 'password': 'password123'}, timeout=10)
+    assert response.status_code == 201
+    publish(app, 'STRM', 100)
+
+    streams = [session.get(f'{server}/api/stream/quotes?symbols=STRM', stream=True, timeout=10) for _ in range(STREAMS)]
+    try:
+        assert all(stream.status_code == 200 for stream in streams)
+        readers = [stream.iter_lines() for stream in streams]
+        assert [next_quote(lines)['price'] for lines in readers] == [100] * STREAMS
+
+        # The open streams leave the worker free for ordinary requests
+        started = time.monotonic()
+        assert session.get(f'{server}/api/me', timeout=10).status_code == 200
+        assert time.monotonic() - started < 2
+
+        publish(app, 'STRM', 101)
+        assert [next_quote(lines)['price'] for lines in readers] == [101] * STREAMS
+    finally:
+        for stream in streams:
+            stream.close()
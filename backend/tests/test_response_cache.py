@@ -0,0 +1,65 @@
+"""Response cache: TTLs that follow US market hours, coalesced misses and stale fallbacks"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import RateLimitExceeded, ResponseCache, cache_expiry
+
+@pytest.mark.parametrize('endpoint, fetched_at, expires', [
+    # Tuesday 10:00 Eastern, market open: the short TTL
+    ('quote', datetime(2024, 6, 11, 14, 0), datetime(2024, 6, 11, 14, 1)),
+    ('daily', datetime(2024, 6, 11, 14, 0), datetime(2024, 6, 11, 14, 15)),
+    # Tuesday 17:00 Eastern: the closed TTL runs out before the next open
+    ('quote', datetime(2024, 6, 11, 21, 0), datetime(2024, 6, 12, 13, 0)),
+    # Wednesday 08:00 Eastern: refresh at the 09:30 open rather than 16 hours later
+    ('quote', datetime(2024, 6, 12, 12, 0), datetime(2024, 6, 12, 13, 30)),
+    # Saturday: weekends use the closed TTL, capped by Monday's open
+    ('quote', datetime(2024, 6, 15, 15, 0), datetime(2024, 6, 16, 7, 0)),
+    ('search', datetime(2024, 6, 16, 20, 0), datetime(2024, 6, 17, 13, 30)),
+    # Winter (EST, UTC-5): 09:29 Eastern is still closed, the open is a minute away
+    ('quote', datetime(2024, 1, 9, 14, 29), datetime(2024, 1, 9, 14, 30)),
+])
+def test_ttl_follows_market_hours(endpoint, fetched_at, expires):
+    assert cache_expiry(endpoint, fetched_at) == expires
+
+def test_concurrent_misses_share_one_fetch(app):
+    cache = ResponseCache()
+    calls, results = [], []
+    started = threading.Barrier(8)
+    
+    def fetch():
+        calls.append(1)
+        time.sleep(0.3)  # long enough for every other thread to arrive while this one is in flight
+        return [{'symbol': 'COAL'}]
+    
+    def request():
+        with app.app_context():
+            started.wait()
+            results.append(cache.get('search', 'coalesce-test', fetch))
+    
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert results == [[{'symbol': 'COAL'}]] * 8
+    stats = cache.get_stats()['endpoints']['search']
+    assert stats['misses'] == 1 and stats['coalesced'] + stats['hits'] == 7
+
+def test_expired_entry_is_served_when_upstream_is_rate_limited(app):
+    cache = ResponseCache()
+    with app.app_context():
+        cache.put('search', 'stale-test', [{'symbol': 'OLD'}])
+        value, fetched_at = cache.entries[('search', 'stale-test')]
+        cache.entries[('search', 'stale-test')] = (value, fetched_at - timedelta(days=3))
+        
+        def fetch():
+            raise RateLimitExceeded(30)
+        assert cache.get('search', 'stale-test', fetch) == [{'symbol': 'OLD'}]
+        assert cache.get_stats()['endpoints']['search']['stale'] == 1
+        with pytest.raises(RateLimitExceeded):
+            cache.get('search', 'never-cached', fetch)
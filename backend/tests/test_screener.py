@@ -0,0 +1,55 @@
+"""Stock screener: the expression whitelist and merging summaries saved by other processes"""
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+import app as stocksim
+from app import SCREEN_FIELDS, compile_screen, db, screener
+
+COLUMNS = {field: np.array([1.0, 2.0, 3.0]) for field in SCREEN_FIELDS}
+
+def test_screen_expressions_evaluate_on_columns():
+    assert compile_screen('close > 1.5 and not volume > 2')(COLUMNS).tolist() == [False, True, False]
+    assert compile_screen('1 < close * 2 - 1 <= 3 or -rsi < -2.5')(COLUMNS).tolist() == [False, True, True]
+
+@pytest.mark.parametrize('expression', [
+    "__import__('os').system('true')",
+    'close.__class__',
+    'close ** 2 > 1',
+    'abs(close) > 1',
+    'close[0] > 1',
+    'lambda: close',
+    'close if rsi else volume',
+    "'a' < 'b'",
+    'True',
+    'price > 1',  # not a screen field
+    'close > ' + '1 + ' * 200 + '1',  # over MAX_SCREEN_EXPRESSION
+    'close >',
+])
+def test_screen_expressions_outside_the_whitelist_are_rejected(expression):
+    with pytest.raises(ValueError):
+        compile_screen(expression)
+
+def summary(close):
+    return dict.fromkeys(SCREEN_FIELDS, 1.0) | {'close': close}
+
+def test_late_commits_with_earlier_timestamps_are_merged(app, monkeypatch):
+    with app.app_context():
+        screener.save([('SCRA', date(2024, 1, 2), summary(10.0))])
+        assert screener.table().loc['SCRA', 'close'] == 10.0
+        
+        # A writer whose clock (or slow transaction) puts its updated_at before the rows already seen
+        class Earlier(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime(2000, 1, 1)
+        monkeypatch.setattr(stocksim, 'datetime', Earlier)
+        screener.save([('SCRA', date(2024, 1, 3), summary(11.0)), ('SCRB', date(2024, 1, 3), summary(5.0))])
+        monkeypatch.undo()
+        
+        table = screener.table()
+        assert table.loc['SCRA', 'close'] == 11.0
+        assert table.loc['SCRB', 'close'] == 5.0
+        assert table.index.is_unique
+        db.session.rollback()
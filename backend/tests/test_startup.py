@@ -0,0 +1,29 @@
+"""Importing the app must not start threads, install signal handlers or create files"""
+import json
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, os, signal, threading
+import app
+before = {'threads': [thread.name for thread in threading.enumerate()],
+          'sigterm_default': signal.getsignal(signal.SIGTERM) == signal.SIG_DFL,
+          'files': os.path.exists(os.environ['PROBE_DATA_DIR'])}
+app.create_app()
+print(json.dumps({'before': before, 'after': [thread.name for thread in threading.enumerate()]}))
+"""
+
+def test_import_has_no_side_effects(tmp_path):
+    data = tmp_path / 'data'
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{data / 'app.db'}", RATE_LIMIT_DB=str(data / 'rate_limit.db'),
+               BAR_FILES_DIR=str(data / 'bars'), PROFILE_DIR=str(data / 'profiles'), QUOTE_REFRESHER='thread',
+               PROBE_DATA_DIR=str(data))
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    
+    assert result['before'] == {'threads': ['MainThread'], 'sigterm_default': True, 'files': False}
+    assert 'quote-refresher' in result['after']
@@ -0,0 +1,47 @@
+"""Stock search: the local index answers symbol matches, weaker hits are merged with upstream results"""
+import pytest
+
+import app as stocksim
+from app import RateLimitExceeded, symbol_index
+
+UPSTREAM = [
+    {'symbol': 'AMD', 'name': 'Advanced Micro Devices Inc', 'type': 'Equity', 'region': 'United States', 'currency': 'USD'},
+    {'symbol': 'MU', 'name': 'Micron Technology Inc', 'type': 'Equity', 'region': 'United States', 'currency': 'USD'},
+    {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'type': 'Equity', 'region': 'United States', 'currency': 'USD'},
+]
+
+@pytest.fixture
+def upstream(app, monkeypatch):
+    """Count upstream searches and answer them with UPSTREAM"""
+    calls = []
+    def search(keywords, priority='interactive'):
+        calls.append(keywords)
+        return [dict(entry) for entry in UPSTREAM]
+    monkeypatch.setattr(stocksim.api_client, 'search_stocks', search)
+    with app.app_context():
+        if not symbol_index.loaded:
+            symbol_index.load()
+    symbol_index.add([{'symbol': 'MSFT', 'name': 'Microsoft Corporation'}])
+    return calls
+
+def symbols(response):
+    assert response.status_code == 200, response.get_json()
+    return [entry['symbol'] for entry in response.get_json()['results']]
+
+def test_name_match_is_merged_with_upstream(client, upstream):
+    found = symbols(client.get('/api/stocks/search/micro'))
+    assert found[0] == 'MSFT'
+    assert {'AMD', 'MU'} <= set(found)
+    assert len(found) == len(set(found))
+    assert upstream == ['micro']
+
+def test_symbol_match_skips_upstream(client, upstream):
+    assert symbols(client.get('/api/stocks/search/MSFT'))[0] == 'MSFT'
+    assert upstream == []
+
+def test_local_results_survive_upstream_rate_limit(client, upstream, monkeypatch):
+    def limited(keywords, priority='interactive'):
+        raise RateLimitExceeded(30)
+    monkeypatch.setattr(stocksim.api_client, 'search_stocks', limited)
+    assert symbols(client.get('/api/stocks/search/microsof'))[0] == 'MSFT'
+    assert client.get('/api/stocks/search/zzqx').status_code == 503
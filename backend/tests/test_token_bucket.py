@@ -0,0 +1,55 @@
+"""Shared token bucket: background work leaves a reserve for interactive requests, tokens refill over time"""
+import pytest
+
+import app as stocksim
+from app import TokenBucket
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(stocksim.time, 'time', lambda: now[0])
+    return now
+
+def test_background_requests_leave_a_reserve(tmp_path, clock):
+    bucket = TokenBucket(str(tmp_path / 'tokens.db'), requests_per_minute=60, capacity=3)
+    assert bucket.try_acquire('background') == 0
+    assert bucket.try_acquire('background') == 0
+    # One token left: background work would need two, so it waits until another refills
+    assert bucket.try_acquire('background') == pytest.approx(1.0)
+    assert bucket.try_acquire('interactive') == 0
+    assert bucket.try_acquire('interactive') == pytest.approx(1.0)
+
+def test_tokens_refill_at_the_rate_up_to_capacity(tmp_path, clock):
+    bucket = TokenBucket(str(tmp_path / 'tokens.db'), requests_per_minute=60, capacity=3)
+    for _ in range(3):
+        assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(1.0)
+    
+    clock[0] += 2
+    assert bucket.try_acquire('background') == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(1.0)
+    
+    clock[0] += 3600  # an idle hour refills to capacity, not beyond
+    for _ in range(3):
+        assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+def test_buckets_share_state_through_the_file(tmp_path, clock):
+    path = str(tmp_path / 'tokens.db')
+    first, second = TokenBucket(path, 60, 2), TokenBucket(path, 60, 2)
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert first.try_acquire() > 0
+
+def test_acquire_gives_up_past_max_wait(tmp_path, clock):
+    bucket = TokenBucket(str(tmp_path / 'tokens.db'), requests_per_minute=1, capacity=1)
+    bucket.acquire()
+    with pytest.raises(stocksim.RateLimitExceeded):
+        bucket.acquire(max_wait=5)
+
+def test_capacity_below_the_reserve_still_serves_background_work(tmp_path, clock):
+    bucket = TokenBucket(str(tmp_path / 'tokens.db'), requests_per_minute=60, capacity=1)
+    assert bucket.try_acquire('background') == 0
+    with pytest.raises(ValueError):
+        TokenBucket(str(tmp_path / 'other.db'), requests_per_minute=60, capacity=0)
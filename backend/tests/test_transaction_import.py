@@ -0,0 +1,108 @@
+"""Bulk import and export: idempotency keys, per-row errors and the streamed export"""
+import csv
+import io
+import json
+
+import pytest
+
+import app as stocksim
+from app import EXPORT_COLUMNS
+
+HEADER = 'symbol,type,quantity,price,date,idempotency_key\n'
+
+def upload(client, body, content_type='text/csv', **headers):
+    response = client.post('/api/portfolio/transactions/import', data=body, content_type=content_type, headers=headers)
+    return response.status_code, response.get_json()
+
+def export(client, fmt):
+    response = client.get(f'/api/portfolio/transactions/export?format={fmt}')
+    assert response.status_code == 200
+    return response
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(stocksim, 'IMPORT_BATCH_SIZE', 2)
+
+def test_idempotency_keys_dedupe_within_and_across_uploads(user_client, small_batches):
+    body = HEADER + ('IMP,buy,1,10,2024-01-01,a\n'
+                     'IMP,buy,2,10,2024-01-02,a\n'  # same batch as the first
+                     'IMP,buy,3,10,2024-01-03,b\n'
+                     'IMP,buy,4,10,2024-01-04,a\n')  # later batch
+    status, result = upload(user_client, body)
+    assert status == 200
+    assert (result['imported'], result['duplicates']) == (2, 2)
+    assert [row['row'] for row in result['duplicate_rows']] == [2, 4]
+    
+    status, result = upload(user_client, body)
+    assert (result['imported'], result['duplicates']) == (0, 4)
+
+def test_idempotency_key_header_covers_rows_without_keys(user_client):
+    body = 'symbol,type,quantity,price,date\nIMP,buy,1,10,2024-01-01\nIMP,buy,1,10,2024-01-02\n'
+    assert upload(user_client, body, **{'Idempotency-Key': 'upload-1'})[1]['imported'] == 2
+    assert upload(user_client, body, **{'Idempotency-Key': 'upload-1'})[1]['imported'] == 0
+    assert upload(user_client, body, **{'Idempotency-Key': 'upload-2'})[1]['imported'] == 2
+    assert upload(user_client, body)[1]['imported'] == 2  # no keys at all: every upload counts
+
+def test_invalid_rows_are_reported_with_207(user_client):
+    body = HEADER + ('IMP,buy,1,10,2024-01-01,\n'
+                     'IMP,hold,1,10,2024-01-01,\n'
+                     'IMP,buy,0.5,10,2024-01-01,\n'
+                     'IMP,buy,nan,10,2024-01-01,\n'
+                     'IMP,buy,1,10,not-a-date,\n')
+    status, result = upload(user_client, body)
+    assert status == 207
+    assert (result['imported'], result['failed']) == (1, 4)
+    assert [error['row'] for error in result['errors']] == [2, 3, 4, 5]
+    assert result['errors'][1]['error'] == 'Quantity must be a whole number of shares'
+
+def test_ndjson_parse_errors_are_per_row(user_client):
+    body = '\n'.join([
+        json.dumps({'symbol': 'IMP', 'type': 'buy', 'quantity': 1, 'price': 10, 'date': '2024-01-01'}),
+        '{"symbol": "IMP",',
+        '[1, 2]',
+        '',
+        json.dumps({'symbol': 'IMP', 'type': 'sell', 'quantity': 1, 'price': 12, 'date': '2024-01-02'}),
+    ]) + '\n'
+    status, result = upload(user_client, body, content_type='application/x-ndjson')
+    assert status == 207
+    assert (result['imported'], result['failed']) == (2, 2)
+    assert result['errors'][0]['row'] == 2 and result['errors'][0]['error'].startswith('Invalid JSON')
+    assert result['errors'][1] == {'row': 3, 'error': 'Each line must be a JSON object'}
+
+def test_upload_that_is_not_utf8_is_rejected(user_client):
+    status, result = upload(user_client, HEADER.encode() + b'IMP,buy,1,10,2024-01-01,\xff\xfe\n')
+    assert status == 400
+    assert result['error'] == 'Upload must be UTF-8 encoded'
+
+def test_export_streams_oldest_first(user_client, small_batches):
+    body = HEADER + ('EXP,buy,3,10,2024-03-01,\n'
+                     'EXP,buy,1,10,2024-01-01,\n'
+                     'EXP,sell,1,11,2024-02-01,\n'
+                     'EXP,buy,2,10,2024-01-01,\n')  # same date as row 2: ordered by id
+    assert upload(user_client, body)[0] == 200
+    
+    lines = export(user_client, 'csv').get_data(as_text=True).splitlines()
+    rows = list(csv.DictReader(io.StringIO('\n'.join(lines))))
+    assert lines[0].split(',') == EXPORT_COLUMNS
+    assert [(row['date'][:10], row['quantity']) for row in rows] == \
+        [('2024-01-01', '1'), ('2024-01-01', '2'), ('2024-02-01', '1'), ('2024-03-01', '3')]
+    assert all(row['idempotency_key'] == f"transaction:{row['id']}" for row in rows)
+    
+    response = export(user_client, 'ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [str(record['id']) for record in records] == [row['id'] for row in rows]
+
+def test_reimporting_an_export_adds_nothing(app, user_client):
+    body = HEADER + 'EXP,buy,3,10,2024-03-01,\nEXP,buy,1,10,2024-01-01,own-key\n'
+    assert upload(user_client, body)[0] == 200
+    exported = export(user_client, 'csv').get_data()
+    
+    status, result = upload(user_client, exported)
+    assert (result['imported'], result['duplicates']) == (0, 2)
+    
+    # Into another account the rows are new once, then deduplicated on their exported keys
+    other = app.test_client()
+    assert other.post('/api/register', json={'username': 'export-target', 'password': 'password123'}).status_code == 201
+    assert upload(other, exported)[1]['imported'] == 2
+    assert upload(other, exported)[1]['imported'] == 0
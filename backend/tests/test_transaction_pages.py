@@ -0,0 +1,78 @@
+"""Keyset pages over transaction history: (date, id) cursors, order, filters and the page size cap"""
+import base64
+
+import pytest
+
+import app as stocksim
+
+ROWS = [  # several rows share a date, so pages have to break ties on id
+    ('PGA', 'buy', '2024-01-01T10:00:00'), ('PGB', 'buy', '2024-01-01T10:00:00'), ('PGA', 'buy', '2024-01-01T10:00:00'),
+    ('PGA', 'sell', '2024-01-02T10:00:00'), ('PGB', 'buy', '2024-01-02T10:00:00'),
+    ('PGC', 'buy', '2024-01-03T09:00:00'), ('PGA', 'buy', '2024-01-03T15:00:00'),
+]
+
+@pytest.fixture
+def history(user_client):
+    body = 'symbol,type,quantity,price,date\n' + ''.join(f'{symbol},{kind},1,10,{date}\n' for symbol, kind, date in ROWS)
+    response = user_client.post('/api/portfolio/transactions/import', data=body, content_type='text/csv')
+    assert response.status_code == 200, response.get_json()
+    return user_client
+
+def pages(client, limit, **params):
+    """Follow next_cursor to the end; returns the ids of every page"""
+    result, cursor = [], None
+    while True:
+        query = dict(params, limit=limit, **({'cursor': cursor} if cursor else {}))
+        body = client.get('/api/portfolio/transactions', query_string=query).get_json()
+        result.append([transaction['id'] for transaction in body['transactions']])
+        cursor = body['next_cursor']
+        assert body['has_more'] == bool(cursor)
+        if not cursor:
+            return result
+
+def ordered(client, **params):
+    body = client.get('/api/portfolio/transactions', query_string=dict(params, limit=100)).get_json()
+    return [(transaction['date'], transaction['id']) for transaction in body['transactions']]
+
+@pytest.mark.parametrize('order', ['desc', 'asc'])
+def test_pages_cover_every_row_once_in_order(history, order):
+    everything = ordered(history, order=order)
+    assert len(everything) == len(ROWS)
+    assert everything == sorted(everything, reverse=order == 'desc')
+    for limit in (1, 2, 3):
+        assert sum(pages(history, limit, order=order), []) == [row_id for _, row_id in everything]
+
+def test_filters_combine_with_cursors(history):
+    rows = ordered(history, symbol='pga,PGC', type='buy')
+    assert len(rows) == 4
+    assert sum(pages(history, 1, symbol='pga,PGC', type='buy'), []) == [row_id for _, row_id in rows]
+    
+    assert len(ordered(history, start='2024-01-02', end='2024-01-02')) == 2  # a bare end date covers the whole day
+    assert len(ordered(history, start='2024-01-03T10:00:00')) == 1
+    assert len(ordered(history, end='2024-01-01T10:00:00')) == 3
+
+def test_portfolio_cursor_continues_after_recent_transactions(history, monkeypatch):
+    monkeypatch.setattr(stocksim, 'RECENT_TRANSACTIONS', 3)
+    body = history.get('/api/portfolio').get_json()
+    recent = [transaction['id'] for transaction in body['recent_transactions']]
+    rest = history.get('/api/portfolio/transactions', query_string={'cursor': body['transactions_cursor']}).get_json()
+    assert recent + [transaction['id'] for transaction in rest['transactions']] == [row_id for _, row_id in ordered(history)]
+
+def test_page_size_is_clamped(history, monkeypatch):
+    monkeypatch.setattr(stocksim, 'MAX_PAGE_SIZE', 3)
+    assert len(history.get('/api/portfolio/transactions?limit=1000').get_json()['transactions']) == 3
+    assert len(history.get('/api/portfolio/transactions?limit=0').get_json()['transactions']) == 1
+
+@pytest.mark.parametrize('cursor', ['not-base64!', 'abc',
+                                    base64.urlsafe_b64encode(b'2024-01-01').decode(),
+                                    base64.urlsafe_b64encode(b'yesterday|1').decode(),
+                                    base64.urlsafe_b64encode(b'2024-01-01T00:00:00|x').decode(),
+                                    base64.urlsafe_b64encode(b'\xff\xfe|1').decode()])
+def test_malformed_cursor_is_rejected(history, cursor):
+    response = history.get('/api/portfolio/transactions', query_string={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid cursor'
+
+def test_invalid_filters_are_rejected(history):
+    assert history.get('/api/portfolio/transactions?type=hold').status_code == 400
+    assert history.get('/api/portfolio/transactions?start=soon').status_code == 400
@@ -0,0 +1,43 @@
+"""Adding transactions: date handling and the Holding rows they maintain"""
+from datetime import datetime
+
+import pytest
+
+from app import Holding, db
+
+def buy(client, date, quantity=10, price=100.0):
+    return client.post('/api/portfolio/transaction', json={
+        'symbol': 'TZT', 'type': 'buy', 'quantity': quantity, 'price': price, 'date': date})
+
+def test_utc_offsets_are_stored_as_naive_utc(app, user_client):
+    assert buy(user_client, '2024-01-02T10:00:00').status_code == 201
+    # Later, earlier (back-dated replay path) and offset dates all compare against the stored naive ones
+    assert buy(user_client, '2024-01-03T00:00:00Z').status_code == 201
+    assert buy(user_client, '2024-01-01T00:00:00Z').status_code == 201
+    response = buy(user_client, '2024-01-04T09:30:00-05:00')
+    assert response.status_code == 201
+    assert response.get_json()['transaction']['date'] == '2024-01-04T14:30:00'
+    
+    with app.app_context():
+        holding = db.session.get(Holding, (user_client.user_id, 'TZT'))
+        assert holding.quantity == 40
+        assert holding.last_transaction_date == datetime(2024, 1, 4, 14, 30)
+
+def test_import_accepts_utc_offsets(app, user_client):
+    assert buy(user_client, '2024-01-02T10:00:00').status_code == 201
+    response = user_client.post('/api/portfolio/transactions/import', data=(
+        'symbol,type,quantity,price,date\n'
+        'TZT,buy,5,100,2024-01-05T00:00:00Z\n'
+        'TZT,sell,5,110,2024-01-01T12:00:00+01:00\n'), content_type='text/csv')
+    assert response.status_code in (200, 201), response.get_json()
+    
+    with app.app_context():
+        holding = db.session.get(Holding, (user_client.user_id, 'TZT'))
+        assert holding.quantity == 10
+        assert holding.last_transaction_date == datetime(2024, 1, 5)
+
+@pytest.mark.parametrize('quantity', [0.5, '2.5', 'nan', 'inf', '-inf'])
+def test_fractional_and_non_finite_quantities_are_rejected(user_client, quantity):
+    response = buy(user_client, '2024-01-02T10:00:00', quantity=quantity)
+    assert response.status_code == 400
+    assert 'Quantity' in response.get_json()['error']
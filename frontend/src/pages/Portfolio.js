@@ -22,6 +22,9 @@ const Portfolio = () => {
     price: '',
     date: new Date().toISOString().split('T')[0]
   });
+  const [olderTransactions, setOlderTransactions] = useState([]);
+  const [transactionsCursor, setTransactionsCursor] = useState(null);
+  const [loadingTransactions, setLoadingTransactions] = useState(false);
   const [submitting, setSubmitting] = useState(false);
   const [clearingTransactions, setClearingTransactions] = useState(false);
   const [clearingHoldings, setClearingHoldings] = useState(false);
@@ -42,6 +45,8 @@ const Portfolio = () => {
     try {
       const response = await axios.get('/api/portfolio');
       setPortfolio(response.data);
+      setOlderTransactions([]);
+      setTransactionsCursor(response.data.transactions_cursor);
       setError('');
     } catch (error) {
       setError('Failed to load portfolio');
@@ -51,6 +56,21 @@ const Portfolio = () => {
     }
   };
 
+  const loadMoreTransactions = async () => {
+    setLoadingTransactions(true);
+    try {
+      const response = await axios.get('/api/portfolio/transactions', {
+        params: { cursor: transactionsCursor, limit: 20 }
+      });
+      setOlderTransactions((previous) => [...previous, ...response.data.transactions]);
+      setTransactionsCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Transaction history error:', error);
+    } finally {
+      setLoadingTransactions(false);
+    }
+  };
+
   const handleSellStock = (holding) => {
     setSellForm({
       symbol: holding.symbol,
@@ -388,7 +408,7 @@ const Portfolio = () => {
             
             {portfolio?.recent_transactions?.length > 0 ? (
               <div className="space-y-3">
-                {portfolio.recent_transactions.map((transaction) => (
+                {[...portfolio.recent_transactions, ...olderTransactions].map((transaction) => (
                   <div key={transaction.id} className="border border-gray-700 rounded-lg p-3">
                     <div className="flex items-center justify-between">
                       <div>
@@ -417,6 +437,15 @@ const Portfolio = () => {
                     </div>
                   </div>
                 ))}
+                {transactionsCursor && (
+                  <button
+                    onClick={loadMoreTransactions}
+                    disabled={loadingTransactions}
+                    className="w-full py-2 text-sm text-blue-400 hover:text-blue-300 disabled:text-gray-500"
+                  >
+                    {loadingTransactions ? 'Loading...' : 'Load older transactions'}
+                  </button>
+                )}
               </div>
             ) : (
               <div className="text-center py-8">
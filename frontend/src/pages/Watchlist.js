@@ -11,6 +11,29 @@ const Watchlist = () => {
     fetchWatchlist();
   }, []);
 
+  // Live price updates for everything on the watchlist, pushed by the server
+  useEffect(() => {
+    const source = new EventSource(`${axios.defaults.baseURL}/api/stream/quotes`, { withCredentials: true });
+    source.addEventListener('quote', (event) => {
+      const { symbol, quote } = JSON.parse(event.data);
+      setWatchlist(current => current.map(item => item.symbol !== symbol ? item : {
+        ...item,
+        stock_data: {
+          ...item.stock_data,
+          last_price: quote.price,
+          ...(quote.change !== undefined && {
+            change: quote.change,
+            change_percent: quote.change_percent,
+            volume: quote.volume,
+            previous_close: quote.previous_close,
+            latest_trading_day: quote.latest_trading_day
+          })
+        }
+      }));
+    });
+    return () => source.close();
+  }, []);
+
   const fetchWatchlist = async () => {
     try {
       const response = await axios.get('/api/watchlist');
@@ -27,32 +50,48 @@ const Watchlist = () => {
   const refreshPrices = async () => {
     setRefreshing(true);
     try {
-      // Fetch updated quotes for all stocks in watchlist
-      const updatedWatchlist = await Promise.all(
-        watchlist.map(async (item) => {
-          try {
-            const response = await axios.get(`/api/stocks/${item.symbol}/quote`);
-            return {
-              ...item,
-              stock_data: {
-                ...item.stock_data,
-                last_price: response.data.quote.price,
-                change: response.data.quote.change,
-                change_percent: response.data.quote.change_percent,
-                volume: response.data.quote.volume,
-                previous_close: response.data.quote.previous_close,
-                latest_trading_day: response.data.quote.latest_trading_day
-              }
-            };
-          } catch (error) {
-            console.error(`Failed to update ${item.symbol}:`, error);
-            return item; // Keep original data if update fails
+      // One batch request for the whole watchlist; quotes stream back as NDJSON lines
+      const symbols = watchlist.map(item => item.symbol).join(',');
+      const response = await fetch(`${axios.defaults.baseURL}/api/stocks/quotes?symbols=${encodeURIComponent(symbols)}`, {
+        credentials: 'include'
+      });
+      if (!response.ok) throw new Error(`Batch quote request failed: ${response.status}`);
+
+      const applyQuote = (line) => {
+        const result = JSON.parse(line);
+        if (!result.quote) {
+          console.error(`Failed to update ${result.symbol}:`, result.error);
+          return; // Keep original data if update fails
+        }
+        setWatchlist(current => current.map(item => item.symbol !== result.symbol ? item : {
+          ...item,
+          stock_data: {
+            ...item.stock_data,
+            last_price: result.quote.price,
+            change: result.quote.change,
+            change_percent: result.quote.change_percent,
+            volume: result.quote.volume,
+            previous_close: result.quote.previous_close,
+            latest_trading_day: result.quote.latest_trading_day
           }
-        })
-      );
-      setWatchlist(updatedWatchlist);
+        }));
+      };
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(applyQuote);
+      }
+      if (buffer.trim()) applyQuote(buffer);
     } catch (error) {
       setError('Failed to refresh prices');
+      console.error('Refresh error:', error);
     } finally {
       setRefreshing(false);
     }